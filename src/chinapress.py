@@ -1,13 +1,30 @@
+import asyncio
+import functools
+import html
+import json
 import logging
+import os
 import re
-from typing import List
+import time
+from typing import Dict, List, Optional, Tuple
 import xml.etree.ElementTree as ET
 
 import feedparser
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from selectolax.lexbor import LexborHTMLParser
+try:
+    # Optional dependency; lets the fallback sources race concurrently
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover
+    aiohttp = None  # type: ignore
+try:
+    # Optional dependency; HTTP/2 homepage fetch tried before launching a browser
+    import httpx  # type: ignore
+except Exception:  # pragma: no cover
+    httpx = None  # type: ignore
 try:
     # Optional dependency; used as a dynamic-rendering fallback
     from playwright.sync_api import sync_playwright  # type: ignore
@@ -21,6 +38,7 @@ HOME_URL = "https://www.chinapress.com.my/"
 WP_JSON_POSTS = f"{HOME_URL.rstrip('/')}/wp-json/wp/v2/posts"
 SITEMAP_INDEX = f"{HOME_URL.rstrip('/')}/sitemap_index.xml"
 POST_SITEMAP = f"{HOME_URL.rstrip('/')}/post-sitemap.xml"
+RSS_CACHE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "rss_cache.json"))
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -34,6 +52,25 @@ DEFAULT_HEADERS = {
     "Connection": "keep-alive",
 }
 
+# URL/markup patterns used in per-entry and per-anchor loops
+_RE_POST_ID = re.compile(r"[?&]p=\d+")
+_RE_YMD_SLASH = re.compile(r"/20\d{2}/\d{1,2}/\d{1,2}/")
+# ?p=123, /YYYY/MM/DD/ or /YYYYMMDD/ in one pass
+_RE_ARTICLE_URL = re.compile(r"[?&]p=\d+|/20\d{2}/\d{1,2}/\d{1,2}/|/20\d{2}\d{2}\d{2}/")
+_RE_YEAR = re.compile(r"/20\d{2}/")
+_RE_TAG = re.compile(r"<[^>]+>")
+
+RSS_HEADERS = {
+    "User-Agent": DEFAULT_HEADERS["User-Agent"],
+    "Accept": "application/rss+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": DEFAULT_HEADERS["Accept-Language"],
+}
+
+_SESSION: Optional[requests.Session] = None
+
+class FeedNotModified(Exception):
+    """The RSS feed answered 304 to a conditional request; nothing new to parse."""
+
 def _create_session() -> requests.Session:
     session = requests.Session()
     session.headers.update(DEFAULT_HEADERS)
@@ -46,11 +83,18 @@ def _create_session() -> requests.Session:
         allowed_methods=frozenset(["GET"]),
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
+def _get_session() -> requests.Session:
+    """Return the shared session so fallbacks reuse one keep-alive connection pool."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = _create_session()
+    return _SESSION
+
 def _extract_images_from_feed_entry(entry) -> List[str]:
     images: List[str] = []
     try:
@@ -70,8 +114,15 @@ def _extract_images_from_feed_entry(entry) -> List[str]:
         pass
     try:
         summary = entry.get("summary", "")
-        for m in re.finditer(r"<img[^>]+src=\"([^\"]+)\"", summary):
-            images.append(m.group(1))
+        # lxml's C tokenizer also handles single-quoted and unquoted src attributes
+        if summary:
+            for frag in lxml_html.fragments_fromstring(summary):
+                if not hasattr(frag, "iter"):
+                    continue
+                for img in frag.iter("img"):
+                    src = img.get("src")
+                    if src:
+                        images.append(src.strip())
     except Exception:
         pass
     seen = set()
@@ -82,14 +133,7 @@ def _extract_images_from_feed_entry(entry) -> List[str]:
             unique.append(u)
     return unique
 
-def fetch_from_rss(max_items: int = 50) -> List[Article]:
-    logging.info("Fetching RSS: %s", RSS_URL)
-    # feedparser supports sending custom request headers to avoid being blocked
-    fp = feedparser.parse(RSS_URL, request_headers={
-        "User-Agent": DEFAULT_HEADERS["User-Agent"],
-        "Accept": "application/rss+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": DEFAULT_HEADERS["Accept-Language"],
-    })
+def _articles_from_feed(fp, max_items: int) -> List[Article]:
     articles: List[Article] = []
     for entry in fp.entries[:max_items]:
         url = getattr(entry, "link", None)
@@ -98,23 +142,95 @@ def fetch_from_rss(max_items: int = 50) -> List[Article]:
             continue
         published = getattr(entry, "published", None) or getattr(entry, "updated", None)
         summary = getattr(entry, "summary", None)
-        images = _extract_images_from_feed_entry(entry)
-        articles.append(Article(title=title.strip(), url=url.strip(), published_at=published, summary=summary, images=images))
+        images_loader = functools.partial(_extract_images_from_feed_entry, entry)
+        articles.append(Article(title=title.strip(), url=url.strip(), published_at=published, summary=summary, images=[], images_loader=images_loader))
+    return articles
+
+def _load_rss_cache() -> dict:
+    if not os.path.exists(RSS_CACHE_PATH):
+        return {}
+    try:
+        with open(RSS_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception as e:
+        logging.warning("Failed to load RSS cache: %s", e)
+        return {}
+
+# Validators of the last feed fetched, held back until commit_rss_validators()
+_HELD_RSS_VALIDATORS: Dict[str, str] = {}
+
+def _hold_rss_validators(headers) -> None:
+    _HELD_RSS_VALIDATORS.clear()
+    if headers.get("ETag"):
+        _HELD_RSS_VALIDATORS["etag"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        _HELD_RSS_VALIDATORS["last_modified"] = headers["Last-Modified"]
+
+def commit_rss_validators() -> None:
+    """Store the ETag/Last-Modified of the last fetched feed so the next run can get a 304.
+
+    Call only once every unseen entry of that feed has been delivered: after
+    that the next run's 304 would hide whatever was left unsent.
+    """
+    if not _HELD_RSS_VALIDATORS:
+        return
+    _save_rss_cache(dict(_HELD_RSS_VALIDATORS))
+    _HELD_RSS_VALIDATORS.clear()
+
+def _save_rss_cache(cache: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(RSS_CACHE_PATH), exist_ok=True)
+        tmp_path = RSS_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, RSS_CACHE_PATH)
+    except OSError as e:
+        logging.warning("Failed to save RSS cache: %s", e)
+
+def _rss_request_headers() -> dict:
+    headers = dict(RSS_HEADERS)
+    cache = _load_rss_cache()
+    if cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+    return headers
+
+def fetch_from_rss(max_items: int = 50) -> List[Article]:
+    logging.info("Fetching RSS: %s", RSS_URL)
+    session = _get_session()
+    with session.get(RSS_URL, headers=_rss_request_headers(), stream=True, timeout=15) as resp:
+        if resp.status_code == 304:
+            logging.info("RSS not modified since last fetch.")
+            raise FeedNotModified()
+        resp.raise_for_status()
+        # Let urllib3 undo gzip so feedparser reads the XML straight off the socket
+        resp.raw.decode_content = True
+        fp = feedparser.parse(resp.raw)
+        articles = _articles_from_feed(fp, max_items)
+        if articles:
+            _hold_rss_validators(resp.headers)
     return articles
 
 def fetch_from_home(max_items: int = 30) -> List[Article]:
     logging.info("Fetching homepage HTML: %s", HOME_URL)
-    session = _create_session()
+    session = _get_session()
     resp = session.get(HOME_URL, timeout=20)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    # Raw bytes go straight to the C parser (the site serves UTF-8)
+    return _parse_home_html(resp.content, max_items)
+
+def _parse_home_html(markup: bytes | str, max_items: int) -> List[Article]:
+    # selectolax (lexbor) keeps the DOM on the C side; only matched anchors cross into Python
+    tree = LexborHTMLParser(markup)
 
     # Fallback strategy: scan all anchor tags and pick article-like URLs
-    anchors = soup.select("a[href]")
+    anchors = tree.css("a[href]")
     articles: List[Article] = []
     seen_urls: set[str] = set()
     for a in anchors:
-        href_raw = a.get("href")
+        href_raw = a.attributes.get("href")
         if not href_raw:
             continue
         url = href_raw.strip()
@@ -122,12 +238,9 @@ def fetch_from_home(max_items: int = 30) -> List[Article]:
         if "chinapress.com.my" not in url:
             continue
         # Filter out navigational/category links by requiring article-like patterns
-        is_post_id = bool(re.search(r"[?&]p=\d+", url))
-        is_yyyy_mm_dd = bool(re.search(r"/20\d{2}/\d{1,2}/\d{1,2}/", url))
-        is_yyyymmdd = bool(re.search(r"/20\d{2}\d{2}\d{2}/", url))
-        if not (is_post_id or is_yyyy_mm_dd or is_yyyymmdd):
+        if not _RE_ARTICLE_URL.search(url):
             continue
-        title = (a.get_text() or "").strip()
+        title = (a.text() or "").strip()
         if len(title) < 6:
             continue
         if url in seen_urls:
@@ -139,6 +252,21 @@ def fetch_from_home(max_items: int = 30) -> List[Article]:
 
     return articles
 
+def fetch_from_home_httpx2(max_items: int = 30) -> List[Article]:
+    """Fetch the homepage over HTTP/2 with httpx.
+
+    Some anti-bot setups reject the HTTP/1.1 requests made by ``requests`` but
+    let a browser-like HTTP/2 client through, which saves a Chromium launch.
+    """
+    if httpx is None:
+        logging.warning("httpx not available; skipping HTTP/2 homepage fallback.")
+        return []
+    logging.info("Fetching homepage via HTTP/2: %s", HOME_URL)
+    with httpx.Client(http2=True, timeout=20.0, headers=DEFAULT_HEADERS, follow_redirects=True) as client:
+        resp = client.get(HOME_URL)
+        resp.raise_for_status()
+        return _parse_home_html(resp.content, max_items)
+
 def fetch_from_home_playwright(max_items: int = 30) -> List[Article]:
     if sync_playwright is None:
         logging.warning("Playwright not available; skipping dynamic rendering fallback.")
@@ -180,7 +308,7 @@ def fetch_from_home_playwright(max_items: int = 30) -> List[Article]:
                 if "chinapress.com.my" not in href:
                     continue
                 # Match /YYYY/MM/DD/ patterns
-                if not re.search(r"/20\d{2}/\d{1,2}/\d{1,2}/", href):
+                if not _RE_YMD_SLASH.search(href):
                     continue
                 title = (a.inner_text() or "").strip()
                 if len(title) < 6:
@@ -220,17 +348,21 @@ def fetch_from_wpjson(max_items: int = 30) -> List[Article]:
     changes and yields recent posts reliably.
     """
     logging.info("Fetching via WP JSON: %s", WP_JSON_POSTS)
-    session = _create_session()
-    params = {
+    session = _get_session()
+    resp = session.get(WP_JSON_POSTS, params=_wpjson_params(max_items), timeout=20)
+    resp.raise_for_status()
+    return _parse_wpjson_items(resp.json(), max_items)
+
+def _wpjson_params(max_items: int) -> dict:
+    return {
         "per_page": min(max_items, 50),
         "page": 1,
         "orderby": "date",
         "order": "desc",
         "_fields": "link,title,excerpt,date",
     }
-    resp = session.get(WP_JSON_POSTS, params=params, timeout=20)
-    resp.raise_for_status()
-    data = resp.json()
+
+def _parse_wpjson_items(data, max_items: int) -> List[Article]:
     articles: List[Article] = []
     for item in data:
         link = (item.get("link") or "").strip()
@@ -238,7 +370,7 @@ def fetch_from_wpjson(max_items: int = 30) -> List[Article]:
         if not link or not title_html:
             continue
         # Strip HTML from title
-        title_text = BeautifulSoup(title_html, "html.parser").get_text().strip()
+        title_text = html.unescape(_RE_TAG.sub("", title_html)).strip()
         if not title_text:
             continue
         articles.append(Article(title=title_text, url=link, published_at=item.get("date"), summary=None, images=[]))
@@ -246,11 +378,13 @@ def fetch_from_wpjson(max_items: int = 30) -> List[Article]:
             break
     return articles
 
-def fetch_latest(max_items: int = 50) -> List[Article]:
+def _fetch_serial(max_items: int) -> List[Article]:
     try:
         rss_items = fetch_from_rss(max_items=max_items)
         if rss_items:
             return rss_items
+    except FeedNotModified:
+        raise
     except Exception as e:
         logging.warning("RSS fetch failed: %s", e)
     # Try sitemap-based fallback first as it is lightweight and reliable
@@ -273,6 +407,156 @@ def fetch_latest(max_items: int = 50) -> List[Article]:
             return items
     except Exception as e:
         logging.error("WP JSON fetch failed: %s", e)
+    return []
+
+async def _afetch_rss(session, max_items: int) -> List[Article]:
+    logging.info("Fetching RSS (async): %s", RSS_URL)
+    async with session.get(RSS_URL, headers=_rss_request_headers()) as resp:
+        if resp.status == 304:
+            logging.info("RSS not modified since last fetch.")
+            raise FeedNotModified()
+        resp.raise_for_status()
+        body = await resp.read()
+        headers = resp.headers
+    articles = _articles_from_feed(feedparser.parse(body), max_items)
+    if articles:
+        _hold_rss_validators(headers)
+    return articles
+
+async def _afetch_sitemap(session, max_items: int) -> List[Article]:
+    logging.info("Fetching via Sitemap (async): %s or %s", POST_SITEMAP, SITEMAP_INDEX)
+
+    limit = max_items * 3
+
+    async def _stream_urls(url: str) -> List[str]:
+        # Parsed off the socket chunk by chunk; the body is never held whole
+        parser = ET.XMLPullParser(events=("end",))
+        urls: List[str] = []
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(SITEMAP_CHUNK_SIZE):
+                if _feed_sitemap_chunk(parser, chunk, urls, limit):
+                    break
+        return urls
+
+    urls = await _stream_urls(POST_SITEMAP)
+    if not urls:
+        async with session.get(SITEMAP_INDEX) as resp:
+            resp.raise_for_status()
+            index = await resp.read()
+        for loc in _parse_sitemap_index(index):
+            urls = await _stream_urls(loc)
+            if urls:
+                break
+    return _articles_from_sitemap_urls(urls, max_items)
+
+async def _afetch_home(session, max_items: int) -> List[Article]:
+    logging.info("Fetching homepage HTML (async): %s", HOME_URL)
+    async with session.get(HOME_URL) as resp:
+        resp.raise_for_status()
+        markup = await resp.read()
+    return _parse_home_html(markup, max_items)
+
+async def _afetch_wpjson(session, max_items: int) -> List[Article]:
+    logging.info("Fetching via WP JSON (async): %s", WP_JSON_POSTS)
+    async with session.get(WP_JSON_POSTS, params=_wpjson_params(max_items)) as resp:
+        resp.raise_for_status()
+        data = await resp.json(content_type=None)
+    return _parse_wpjson_items(data, max_items)
+
+async def _guarded(name: str, coro, errors: List[Tuple[str, Exception]]) -> List[Article]:
+    try:
+        return await coro
+    except FeedNotModified:
+        raise
+    except Exception as e:
+        # Reported by _race only if no source produced anything
+        errors.append((name, e))
+        return []
+
+# How long RSS gets on its own before the fallback sources are started too
+RACE_HEDGE_DELAY = 3.0
+
+async def _race(max_items: int) -> List[Article]:
+    """Fetch RSS, starting the other lightweight sources only if it fails or stalls.
+
+    RSS runs alone for RACE_HEDGE_DELAY seconds, so a healthy feed costs the
+    origin one request. Otherwise every fallback starts at once and sources are
+    awaited in the serial chain's priority order; the first non-empty result
+    wins and the remaining tasks are cancelled. Failures are logged as errors
+    only when no source succeeds.
+    """
+    timeout = aiohttp.ClientTimeout(total=15)
+    connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+    errors: List[Tuple[str, Exception]] = []
+    async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=timeout, connector=connector) as session:
+        tasks = [asyncio.create_task(_guarded("RSS", _afetch_rss(session, max_items), errors))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=RACE_HEDGE_DELAY)
+            if done and tasks[0].result():
+                return tasks[0].result()
+            tasks += [
+                asyncio.create_task(_guarded("Sitemap", _afetch_sitemap(session, max_items), errors)),
+                asyncio.create_task(_guarded("Homepage", _afetch_home(session, max_items), errors)),
+                asyncio.create_task(_guarded("WP JSON", _afetch_wpjson(session, max_items), errors)),
+            ]
+            for task in tasks:
+                items = await task
+                if items:
+                    for name, e in errors:
+                        logging.debug("%s fetch failed: %s", name, e)
+                    return items
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    for name, e in errors:
+        logging.error("%s fetch failed: %s", name, e)
+    return []
+
+# Results are reused for this many seconds, keyed by max_items
+FETCH_CACHE_TTL = 60.0
+_FETCH_CACHE: Dict[int, Tuple[float, List[Article]]] = {}
+
+def fetch_latest(max_items: int = 50) -> List[Article]:
+    """Return the latest articles, reusing a result fetched in the last FETCH_CACHE_TTL seconds.
+
+    Only non-empty results are cached so a failed or not-modified fetch is
+    retried on the next call. ``fetch_latest.cache_clear()`` drops the cache.
+    """
+    now = time.monotonic()
+    cached = _FETCH_CACHE.get(max_items)
+    if cached is not None and now - cached[0] < FETCH_CACHE_TTL:
+        return list(cached[1])
+    items = _fetch_latest_uncached(max_items)
+    if items:
+        _FETCH_CACHE[max_items] = (now, items)
+    return list(items)
+
+fetch_latest.cache_clear = _FETCH_CACHE.clear  # type: ignore[attr-defined]
+
+def _fetch_latest_uncached(max_items: int) -> List[Article]:
+    if aiohttp is not None:
+        try:
+            items = asyncio.run(_race(max_items))
+        except FeedNotModified:
+            return []
+        except Exception as e:
+            logging.error("Async fetch failed: %s", e)
+            items = []
+    else:
+        try:
+            items = _fetch_serial(max_items)
+        except FeedNotModified:
+            return []
+    if items:
+        return items
+    try:
+        items = fetch_from_home_httpx2(max_items=max_items)
+        if items:
+            return items
+    except Exception as e:
+        logging.error("Homepage (HTTP/2) fetch failed: %s", e)
     # Last resort: dynamic rendering
     try:
         items = fetch_from_home_playwright(max_items=max_items)
@@ -282,62 +566,65 @@ def fetch_latest(max_items: int = 50) -> List[Article]:
         logging.error("Homepage (Playwright) fetch failed: %s", e)
     return []
 
-def fetch_from_sitemap(max_items: int = 30) -> List[Article]:
-    """Parse WordPress sitemaps to retrieve latest posts.
+_SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
 
-    Strategy:
-    1. Try post-sitemap.xml directly
-    2. If not present, parse sitemap_index.xml to find the newest post sitemap
+# Bytes fed to the sitemap pull parser per read
+SITEMAP_CHUNK_SIZE = 64 * 1024
+
+def _feed_sitemap_chunk(parser: ET.XMLPullParser, chunk: bytes, urls: List[str], limit: int) -> bool:
+    """Feed one chunk of a urlset sitemap, collecting <loc> entries into ``urls``.
+
+    Returns True once ``limit`` is reached or the document stops parsing (some
+    servers return HTML), so the caller can stop reading. Each <url> element is
+    cleared once read so memory stays flat however large the sitemap is.
     """
-    logging.info("Fetching via Sitemap: %s or %s", POST_SITEMAP, SITEMAP_INDEX)
-    session = _create_session()
+    try:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag == f"{_SITEMAP_NS}loc":
+                loc = (elem.text or "").strip()
+                if loc and "chinapress.com.my" in loc:
+                    urls.append(loc)
+                    if len(urls) >= limit:
+                        return True
+            elif elem.tag == f"{_SITEMAP_NS}url":
+                elem.clear()
+    except ET.ParseError:
+        # Keep whatever parsed before the error
+        return True
+    return False
 
-    # Helper to parse a given sitemap URL for <url><loc> entries
-    def _parse_sitemap_urls(url: str) -> List[str]:
-        resp = session.get(url, timeout=20)
-        resp.raise_for_status()
-        # Some servers return HTML; try to parse regardless
-        try:
-            root = ET.fromstring(resp.text)
-        except ET.ParseError:
-            return []
-        ns_urlset = "{http://www.sitemaps.org/schemas/sitemap/0.9}url"
-        urls: List[str] = []
-        for url_node in root.findall(f".//{ns_urlset}"):
-            loc = url_node.findtext("{http://www.sitemaps.org/schemas/sitemap/0.9}loc")
-            if loc and "chinapress.com.my" in loc:
-                urls.append(loc.strip())
-        return urls
+def _parse_sitemap_urls(source, limit: int) -> List[str]:
+    """Stream the <url><loc> entries of a urlset sitemap from a binary file-like object."""
+    parser = ET.XMLPullParser(events=("end",))
+    urls: List[str] = []
+    while True:
+        chunk = source.read(SITEMAP_CHUNK_SIZE)
+        if not chunk or _feed_sitemap_chunk(parser, chunk, urls, limit):
+            break
+    return urls
 
-    # 1) Direct post sitemap
-    urls = _parse_sitemap_urls(POST_SITEMAP)
-    if not urls:
-        # 2) sitemap index -> find post sitemaps and pick the latest
-        resp = session.get(SITEMAP_INDEX, timeout=20)
-        resp.raise_for_status()
-        try:
-            root = ET.fromstring(resp.text)
-        except ET.ParseError:
-            root = None
-        if root is not None:
-            ns_sitemap = "{http://www.sitemaps.org/schemas/sitemap/0.9}sitemap"
-            entries = []
-            for sm in root.findall(f".//{ns_sitemap}"):
-                loc = sm.findtext("{http://www.sitemaps.org/schemas/sitemap/0.9}loc")
-                if not loc:
-                    continue
-                if "post-sitemap" in loc:
-                    entries.append(loc.strip())
-            # Try latest by lexical order
-            for loc in sorted(entries, reverse=True):
-                urls = _parse_sitemap_urls(loc)
-                if urls:
-                    break
+def _parse_sitemap_index(xml_text: bytes | str) -> List[str]:
+    """Return post sitemap locations from a sitemap index, newest first."""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError:
+        return []
+    entries = []
+    for sm in root.findall(f".//{_SITEMAP_NS}sitemap"):
+        loc = sm.findtext(f"{_SITEMAP_NS}loc")
+        if not loc:
+            continue
+        if "post-sitemap" in loc:
+            entries.append(loc.strip())
+    # Latest by lexical order
+    return sorted(entries, reverse=True)
 
+def _articles_from_sitemap_urls(urls: List[str], max_items: int) -> List[Article]:
     articles: List[Article] = []
     for u in urls[:max_items * 3]:
         # Filter out obvious non-article pages
-        if not (re.search(r"/20\d{2}/", u) or re.search(r"[?&]p=\d+", u)):
+        if not (_RE_YEAR.search(u) or _RE_POST_ID.search(u)):
             continue
         title = u.rsplit('/', 2)[-2].replace('-', ' ')
         if not title:
@@ -346,3 +633,33 @@ def fetch_from_sitemap(max_items: int = 30) -> List[Article]:
         if len(articles) >= max_items:
             break
     return articles
+
+def fetch_from_sitemap(max_items: int = 30) -> List[Article]:
+    """Parse WordPress sitemaps to retrieve latest posts.
+
+    Strategy:
+    1. Try post-sitemap.xml directly
+    2. If not present, parse sitemap_index.xml to find the newest post sitemap
+    """
+    logging.info("Fetching via Sitemap: %s or %s", POST_SITEMAP, SITEMAP_INDEX)
+    session = _get_session()
+
+    limit = max_items * 3
+
+    def _stream_urls(url: str) -> List[str]:
+        with session.get(url, stream=True, timeout=20) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            return _parse_sitemap_urls(resp.raw, limit)
+
+    # 1) Direct post sitemap
+    urls = _stream_urls(POST_SITEMAP)
+    if not urls:
+        # 2) sitemap index -> find post sitemaps and pick the latest
+        resp = session.get(SITEMAP_INDEX, timeout=20)
+        resp.raise_for_status()
+        for loc in _parse_sitemap_index(resp.content):
+            urls = _stream_urls(loc)
+            if urls:
+                break
+    return _articles_from_sitemap_urls(urls, max_items)
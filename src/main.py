@@ -1,46 +1,171 @@
 import logging
 import os
-from typing import Optional
+from datetime import datetime
+from html import escape
+from itertools import islice
+from operator import attrgetter
+from typing import List, NamedTuple, Optional, Tuple
 
-import requests
+from .chinapress import commit_rss_validators, fetch_latest
+from .state_store import StateStore
+from .telegram_client import MEDIA_GROUP_MAX, TelegramClient, TelegramError, chunk_texts, read_env
 
+logger = logging.getLogger(__name__)
 
-def _env_truthy(name: str, default: bool = False) -> bool:
-    raw = os.getenv(name)
+def build_message(title: str, url: str, published: str | None) -> str:
+    """Telegram HTML for one article; every feed-supplied field is escaped so <, > and & read literally."""
+    title, url = escape(title, quote=False), escape(url, quote=False)
+    if published:
+        return f"<b>{title}</b>\n🕒 {escape(published, quote=False)}\n{url}"
+    return f"<b>{title}</b>\n{url}"
+
+def parse_int_env(var_name: str, default: int) -> int:
+    """Safely parse integer from environment variable, fallback to default if invalid or empty."""
+    raw = read_env(var_name)
     if raw is None:
         return default
-    return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
-
-
-class TelegramClient:
-    def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None) -> None:
-        self.bot_token = bot_token or os.getenv("TELEGRAM_BOT_TOKEN")
-        self.chat_id = chat_id or os.getenv("TELEGRAM_CHAT_ID")
-        self.dry_run = _env_truthy("TELEGRAM_DRY_RUN", default=False)
-
-        if not self.bot_token or not self.chat_id:
-            if self.dry_run:
-                logging.warning("Telegram is in DRY_RUN mode (missing token/chat). Messages will not be sent.")
-                self.base_url = None
-                return
-            if not self.bot_token:
-                raise ValueError("Missing TELEGRAM_BOT_TOKEN")
-            if not self.chat_id:
-                raise ValueError("Missing TELEGRAM_CHAT_ID")
-
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
-
-    def send_message(self, text: str, disable_web_page_preview: bool = False) -> None:
-        if self.dry_run or not self.base_url or not self.chat_id:
-            logging.info("[DRY_RUN] Would send Telegram message: %s", text)
-            return
-        payload = {
-            "chat_id": self.chat_id,
-            "text": text,
-            "parse_mode": "HTML",
-            "disable_web_page_preview": disable_web_page_preview,
-        }
-        resp = requests.post(f"{self.base_url}/sendMessage", json=payload, timeout=20)
-        if not resp.ok:
-            logging.error("Telegram sendMessage failed: %s %s", resp.status_code, resp.text)
-            resp.raise_for_status()
+    try:
+        return int(raw) if raw.strip() else default
+    except ValueError:
+        logger.warning("Invalid value for %s=%r, using default: %d", var_name, raw, default)
+        return default
+
+# (url, text, photo_url) for one article ready to send
+_Pending = Tuple[str, str, Optional[str]]
+
+class _Send(NamedTuple):
+    """One Telegram call and the article URLs it delivers."""
+    urls: List[str]
+    text: Optional[str] = None
+    album: Optional[List[Tuple[str, str]]] = None  # (photo_url, caption) pairs
+
+    @property
+    def fallback_text(self) -> str:
+        # A rejected album (usually an image Telegram cannot fetch) goes out as one text message
+        return "\n\n".join(caption for _, caption in self.album or [])
+
+def _collect_pending(articles, state: StateStore, max_items_total: int) -> Tuple[List[_Pending], bool]:
+    """Return up to max_items_total unseen articles as (url, text, photo_url).
+
+    The flag is True when more unseen articles were left beyond the cap.
+    """
+    # First pass only filters, so messages and images are built just for what will be sent;
+    # the state's digest check also drops a URL a source lists twice within one run.
+    # One extra is read to tell whether the cap left anything behind.
+    unseen = list(islice(state.iter_unseen(articles, key=attrgetter("url")), max_items_total + 1))
+    more = len(unseen) > max_items_total
+    del unseen[max_items_total:]
+    pending: List[_Pending] = []
+    # Bound once so the loop does fast local loads instead of global/attribute lookups
+    build, push = build_message, pending.append
+    for article in unseen:
+        url = article.url
+        images = article.get_images()
+        push((url, build(article.title, url, article.published_at), images[0] if images else None))
+    return pending, more
+
+def _album_groups(items: List[_Pending]) -> List[List[_Pending]]:
+    """Split a run of image articles into media groups of 2..MEDIA_GROUP_MAX, keeping order."""
+    groups = [items[i:i + MEDIA_GROUP_MAX] for i in range(0, len(items), MEDIA_GROUP_MAX)]
+    if len(groups) > 1 and len(groups[-1]) == 1:
+        # sendMediaGroup needs at least two items; borrow one from the previous group
+        groups[-1].insert(0, groups[-2].pop())
+    return groups
+
+def _plan_sends(pending: List[_Pending]) -> List[_Send]:
+    """Turn pending articles into Telegram calls that post in the feed's newest-first order.
+
+    Consecutive image articles become media groups and consecutive text-only
+    ones (including a lone image article) are joined into batched messages.
+    """
+    # Runs of consecutive items that do / do not have a photo
+    runs: List[Tuple[bool, List[_Pending]]] = []
+    for item in pending:
+        is_album = item[2] is not None
+        if runs and runs[-1][0] == is_album:
+            runs[-1][1].append(item)
+        else:
+            runs.append((is_album, [item]))
+    merged: List[Tuple[bool, List[_Pending]]] = []
+    for is_album, items in runs:
+        if is_album and len(items) == 1:
+            is_album = False
+        if merged and not is_album and not merged[-1][0]:
+            merged[-1][1].extend(items)
+        else:
+            merged.append((is_album, items))
+
+    sends: List[_Send] = []
+    for is_album, items in merged:
+        if is_album:
+            for group in _album_groups(items):
+                album = [(photo, text) for _, text, photo in group]
+                sends.append(_Send(urls=[url for url, _, _ in group], album=album))
+            continue
+        offset = 0
+        for chunk in chunk_texts([text for _, text, _ in items]):
+            urls = [url for url, _, _ in items[offset:offset + len(chunk)]]
+            sends.append(_Send(urls=urls, text="\n\n".join(chunk)))
+            offset += len(chunk)
+    return sends
+
+def _deliver(tg: TelegramClient, send: _Send) -> None:
+    if send.album:
+        try:
+            tg.send_media_group(send.album)
+        except TelegramError as e:
+            logger.warning("Media group failed, sending as text: %s", e)
+            tg.send_message(send.fallback_text)
+    else:
+        tg.send_message(send.text)
+
+def _send_all(tg: TelegramClient, sends: List[_Send], state: StateStore) -> int:
+    """Deliver sends one at a time in plan order; returns URLs delivered."""
+    delivered = 0
+    for send in sends:
+        try:
+            _deliver(tg, send)
+        except TelegramError as e:
+            logger.error("Telegram send failed: %s", e)
+            continue
+        # Written through right away so a crash later in the run cannot re-send it
+        state.append_delta(send.urls)
+        delivered += len(send.urls)
+    return delivered
+
+def main() -> int:
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+    max_items_total = parse_int_env("MAX_ITEMS_PER_RUN", 10)
+    state = StateStore()
+    state.load()
+    tg = TelegramClient()
+
+    # Fetch a deeper window than the cap so posts beyond it in a burst are reached on later runs
+    articles = fetch_latest(max_items=max_items_total * 3)
+    if not articles:
+        logger.info("No articles fetched.")
+        return 0
+    pending, more = _collect_pending(articles, state, max_items_total)
+    sends = _plan_sends(pending)
+    sent_count = 0
+    try:
+        with tg:
+            sent_count = _send_all(tg, sends, state)
+    finally:
+        # Sent URLs are already on disk via append_delta(); this only compacts when due
+        state.save()
+    if sent_count == len(pending) and not more:
+        # Nothing in this feed is left unsent, so the next run may revalidate it to a 304
+        commit_rss_validators()
+
+    # Skip building the timestamp when INFO records would be dropped anyway
+    if logger.isEnabledFor(logging.INFO):
+        if sent_count > 0:
+            logger.info("Sent %d new items at %s", sent_count, datetime.utcnow().isoformat())
+        else:
+            logger.info("No new items to send.")
+    return 0 if sent_count == len(pending) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,18 @@
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Callable, Optional, List
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     title: str
     url: str
     published_at: Optional[str]  # ISO 8601 string if available
     summary: Optional[str]
     images: List[str]
+    # Deferred image extraction; resolved by get_images() only for articles that get sent
+    images_loader: Optional[Callable[[], List[str]]] = field(default=None, repr=False, compare=False)
+
+    def get_images(self) -> List[str]:
+        if self.images_loader is not None:
+            self.images = self.images_loader()
+            self.images_loader = None
+        return self.images
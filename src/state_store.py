@@ -1,41 +1,207 @@
+import hashlib
+import itertools
 import json
 import logging
 import os
-from typing import Set
+from typing import Callable, Iterable, Iterator, List, Optional, Set, TypeVar
 
-DEFAULT_STATE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "seen.json"))
+try:
+    # Optional dependency; C encoder/decoder for the state lines
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+T = TypeVar("T")
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+DEFAULT_STATE_PATH = os.path.join(DATA_DIR, "seen.ndjson")
+# Pre-ndjson state file; read once to migrate when the ndjson file does not exist yet
+LEGACY_STATE_PATH = os.path.join(DATA_DIR, "seen.json")
+
+def _encode_line(key: str) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(key) + b"\n"
+    return json.dumps(key, ensure_ascii=False).encode("utf-8") + b"\n"
+
+def _decode_line(line: bytes) -> str:
+    # orjson.JSONDecodeError subclasses ValueError, like json's
+    if orjson is not None:
+        return str(orjson.loads(line))
+    return str(json.loads(line))
+
+def _hash(key: str) -> int:
+    """Stable 64-bit digest of a key; collisions are negligible at this scale."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
 
 class StateStore:
-    def __init__(self, path: str = DEFAULT_STATE_PATH) -> None:
+    """Seen-URL set persisted as an append-only file of JSON strings, one per line.
+
+    A run only appends the keys it added, so the write cost is O(new items)
+    rather than re-serializing the whole history. The file keeps the raw URLs
+    for auditing; in memory only their 64-bit digests are held.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH, legacy_path: Optional[str] = LEGACY_STATE_PATH) -> None:
         self.path = path
+        self.legacy_path = legacy_path
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        self._seen: Set[str] = set()
+        self._seen: Set[int] = set()
+        self._pending: List[str] = []
+        # Lines currently in the file, including duplicates and unreadable ones
+        self._line_count = 0
+        # Set when the file has a torn line that appending would run into
+        self._needs_rewrite = False
+        # Added but not yet on disk, or the file needs a rewrite
+        self._dirty = False
 
     def load(self) -> None:
+        self._seen = set()
+        self._pending = []
+        self._line_count = 0
+        self._needs_rewrite = False
+        self._dirty = False
         if not os.path.exists(self.path):
+            self._load_legacy()
+            return
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self._line_count += 1
+                    try:
+                        self._seen.add(_hash(_decode_line(line)))
+                    except ValueError:
+                        # A torn last line from an interrupted append; the next save rewrites it away
+                        logging.warning("Skipping unreadable state line: %r", line)
+                        self._needs_rewrite = True
+                        self._dirty = True
+        except Exception as e:
+            logging.warning("Failed to load state: %s", e)
             self._seen = set()
+
+    def _load_legacy(self) -> None:
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
             return
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
             if isinstance(data, list):
-                self._seen = set(map(str, data))
+                keys = list(map(str, data))
             elif isinstance(data, dict) and "seen" in data:
-                self._seen = set(map(str, data["seen"]))
+                keys = list(map(str, data["seen"]))
             else:
-                self._seen = set()
+                keys = []
         except Exception as e:
-            logging.warning("Failed to load state: %s", e)
-            self._seen = set()
+            logging.warning("Failed to load legacy state: %s", e)
+            return
+        for key in keys:
+            self.add(key)
+        if self._pending:
+            logging.info("Migrating %d seen entries from %s", len(self._pending), self.legacy_path)
+            self._rewrite()
 
     def has(self, key: str) -> bool:
-        return key in self._seen
+        return _hash(key) in self._seen
+
+    def iter_unseen(self, items: Iterable[T], key: Callable[[T], str]) -> Iterator[T]:
+        """Lazily yield items whose key is neither stored nor repeated earlier in ``items``.
+
+        Each key is hashed once; the digest serves both the stored-state check
+        and the within-batch duplicate check.
+        """
+        seen = self._seen
+        batch: Set[int] = set()
+        for item in items:
+            h = _hash(key(item))
+            if h in seen or h in batch:
+                continue
+            batch.add(h)
+            yield item
 
     def add(self, key: str) -> None:
-        self._seen.add(key)
+        h = _hash(key)
+        if h in self._seen:
+            return
+        self._seen.add(h)
+        self._pending.append(key)
+        self._dirty = True
+
+    def append(self, key: str) -> None:
+        self.append_delta((key,))
+
+    def append_delta(self, keys: Iterable[str]) -> None:
+        """Add ``keys`` and durably append the new ones to the file in one write.
+
+        The file is opened in append mode, written, fsynced and closed, so the
+        cost is O(len(keys)) rather than O(history), and a run that dies right
+        after this call does not re-send what it recorded.
+        """
+        for key in keys:
+            self.add(key)
+        if not self._dirty:
+            return
+        if self._needs_rewrite:
+            self._rewrite()
+            return
+        self._write_pending()
+        self._dirty = False
 
     def save(self) -> None:
+        """Persist keys add()ed since the last write, then compact if most of the file is redundant."""
+        if self._dirty:
+            if self._needs_rewrite:
+                self._rewrite()
+            else:
+                self._write_pending()
+            self._dirty = False
+        self.compact()
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        with open(self.path, "ab") as f:
+            f.write(b"".join(_encode_line(key) for key in self._pending))
+            f.flush()
+            os.fsync(f.fileno())
+        self._line_count += len(self._pending)
+        self._pending = []
+
+    def compact(self, force: bool = False) -> None:
+        """Rewrite the file without duplicate or unreadable lines once most of it is redundant."""
+        if not force and self._line_count <= 2 * len(self._seen):
+            return
+        self._rewrite()
+
+    def _iter_file_keys(self) -> Iterator[str]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield _decode_line(line)
+                except ValueError:
+                    continue
+
+    def _rewrite(self) -> None:
+        # Only digests are in memory, so the raw keys are streamed back from the file
         tmp_path = self.path + ".tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(sorted(self._seen), f, ensure_ascii=False, indent=2)
+        written: Set[int] = set()
+        with open(tmp_path, "wb") as f:
+            for key in itertools.chain(self._iter_file_keys(), self._pending):
+                h = _hash(key)
+                if h in written:
+                    continue
+                written.add(h)
+                f.write(_encode_line(key))
+            f.flush()
+            os.fsync(f.fileno())
         os.replace(tmp_path, self.path)
+        self._pending = []
+        self._dirty = False
+        self._line_count = len(self._seen)
+        self._needs_rewrite = False
@@ -1,57 +1,206 @@
+import functools
+import json
 import logging
 import os
-from datetime import datetime
-
-from .chinapress import fetch_latest
-from .state_store import StateStore
-from .telegram_client import TelegramClient
-
-def build_message(title: str, url: str, published: str | None) -> str:
-    parts = [f"<b>{title}</b>"]
-    if published:
-        parts.append(f"🕒 {published}")
-    parts.append(url)
-    return "\n".join(parts)
-
-def parse_int_env(var_name: str, default: int) -> int:
-    """Safely parse integer from environment variable, fallback to default if invalid or empty."""
-    raw = os.getenv(var_name, str(default))
+import socket
+from typing import List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    # Optional dependency; C JSON encoder for request bodies
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_HOST = "api.telegram.org"
+# Telegram accepts 2-10 items per sendMediaGroup call
+MEDIA_GROUP_MAX = 10
+# sendMessage allows 4096 characters; leave headroom when joining several articles
+MESSAGE_BATCH_LIMIT = 4000
+# Transient statuses (429 is Telegram's rate limit) retried on the pooled connection
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "y", "on"})
+
+
+@functools.lru_cache(maxsize=None)
+def read_env(name: str) -> Optional[str]:
+    """os.getenv, read once per process; call read_env.cache_clear() after changing the environment."""
+    return os.getenv(name)
+
+
+def _env_truthy(name: str, default: bool = False) -> bool:
+    raw = read_env(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in _TRUTHY
+
+
+@functools.lru_cache(maxsize=None)
+def _warm_dns(host: str, port: int = 443) -> None:
+    """Resolve ``host`` once per process so the first send finds it in the resolver cache."""
     try:
-        return int(raw) if raw.strip() else default
+        socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as e:
+        # The request itself will retry the lookup and report a real failure
+        logger.debug("DNS pre-resolve of %s failed: %s", host, e)
+
+
+class TelegramError(Exception):
+    """A Telegram API call failed; the message never includes the request URL (it embeds the bot token)."""
+
+    def __init__(self, method: str, status: Optional[int], description: str) -> None:
+        super().__init__(f"{method} failed: {status if status is not None else 'no response'} {description}")
+        self.method = method
+        self.status = status
+        self.description = description
+
+
+def _error_description(resp: requests.Response) -> str:
+    try:
+        return str(resp.json().get("description") or resp.reason)
     except ValueError:
-        logging.warning("Invalid value for %s=%r, using default: %d", var_name, raw, default)
-        return default
+        return str(resp.reason)
+
+
+def chunk_texts(texts: List[str]) -> List[List[str]]:
+    """Group texts greedily so each group joined by blank lines fits MESSAGE_BATCH_LIMIT."""
+    chunks: List[List[str]] = []
+    size = 0
+    for text in texts:
+        if chunks and size + 2 + len(text) <= MESSAGE_BATCH_LIMIT:
+            chunks[-1].append(text)
+            size += 2 + len(text)
+        else:
+            chunks.append([text])
+            size = len(text)
+    return chunks
+
+
+class TelegramClient:
+    """Sends to one chat over a pooled requests.Session, retrying transient failures.
+
+    Calls are made one at a time: Telegram allows about one message per
+    second per chat, so all a run needs is the kept-alive connection.
+    """
+
+    def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None) -> None:
+        self.bot_token = bot_token or read_env("TELEGRAM_BOT_TOKEN")
+        self.chat_id = chat_id or read_env("TELEGRAM_CHAT_ID")
+        self.dry_run = _env_truthy("TELEGRAM_DRY_RUN", default=False)
+        self._headers = {"Content-Type": "application/json"}
+
+        # One pooled session so consecutive sends reuse the TLS connection
+        self.session = requests.Session()
+        retry = Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=1)
+        self.session.mount("https://", adapter)
+
+        if not self.bot_token or not self.chat_id:
+            if self.dry_run:
+                logger.warning("Telegram is in DRY_RUN mode (missing token/chat). Messages will not be sent.")
+                self.base_url = None
+                self.send_url = None
+                self.media_group_url = None
+                self._base_payload = {}
+                return
+            if not self.bot_token:
+                raise ValueError("Missing TELEGRAM_BOT_TOKEN")
+            if not self.chat_id:
+                raise ValueError("Missing TELEGRAM_CHAT_ID")
+
+        _warm_dns(TELEGRAM_API_HOST)
+        self.base_url = f"https://{TELEGRAM_API_HOST}/bot{self.bot_token}"
+        # Fixed per client, so built once rather than on every send
+        self.send_url = self.base_url + "/sendMessage"
+        self.media_group_url = self.base_url + "/sendMediaGroup"
+        self._base_payload = {"chat_id": self.chat_id}
+        if self._sending_disabled:
+            return
+        # URL, headers and environment settings resolved once; each send only swaps the body
+        self._prep_message = self._prepare(self.send_url)
+        self._prep_media_group = self._prepare(self.media_group_url)
+        # Session.send skips the proxy/CA-bundle lookup that Session.post does
+        self._send_settings = self.session.merge_environment_settings(self.base_url, {}, None, None, None)
+
+    @property
+    def _sending_disabled(self) -> bool:
+        return self.dry_run or not self.base_url or not self.chat_id
+
+    @staticmethod
+    def _encode(payload: dict) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _log_dry_run(kind: str, content) -> None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[DRY_RUN] Would send Telegram %s: %s", kind, content)
+
+    def _prepare(self, url: str) -> requests.PreparedRequest:
+        return self.session.prepare_request(requests.Request("POST", url, headers=self._headers))
+
+    def _post(self, template: requests.PreparedRequest, payload: dict, method: str) -> None:
+        """POST ``payload``; raises TelegramError, never a requests exception carrying the URL."""
+        # Copied so the shared template never carries a previous body
+        prep = template.copy()
+        prep.prepare_body(data=self._encode(payload), files=None)
+        try:
+            resp = self.session.send(prep, timeout=20, **self._send_settings)
+        except requests.RequestException as e:
+            # str(e) of connection and retry errors quotes the URL, and with it the token
+            raise TelegramError(method, None, type(e).__name__) from None
+        if not resp.ok:
+            raise TelegramError(method, resp.status_code, _error_description(resp))
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "TelegramClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def send_message(self, text: str, disable_web_page_preview: bool = False, parse_mode: Optional[str] = "HTML") -> None:
+        """Send one message; ``parse_mode=None`` sends ``text`` as plain text."""
+        if self._sending_disabled:
+            self._log_dry_run("message", text)
+            return
+        payload = self._base_payload.copy()
+        payload["text"] = text
+        payload["disable_web_page_preview"] = disable_web_page_preview
+        # Without parse_mode Telegram takes the text verbatim and skips entity parsing
+        if parse_mode is not None:
+            payload["parse_mode"] = parse_mode
+        self._post(self._prep_message, payload, "sendMessage")
 
-def main() -> int:
-    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
-
-    max_items_total = parse_int_env("MAX_ITEMS_PER_RUN", 10)
-    state = StateStore()
-    state.load()
-    tg = TelegramClient()
-
-    articles = fetch_latest(max_items=max_items_total * 3)
-    if not articles:
-        logging.info("No articles fetched.")
-        return 0
-
-    sent_count = 0
-    for article in articles:
-        if state.has(article.url):
-            continue
-        text = build_message(article.title, article.url, article.published_at)
-        tg.send_message(text)
-        state.add(article.url)
-        sent_count += 1
-        if sent_count >= max_items_total:
-            break
-
-    if sent_count > 0:
-        state.save()
-        logging.info("Sent %d new items at %s", sent_count, datetime.utcnow().isoformat())
-    else:
-        logging.info("No new items to send.")
-    return 0
-
-if __name__ == "__main__":
-    raise SystemExit(main())
+    def send_media_group(self, items: List[Tuple[str, str]], parse_mode: Optional[str] = "HTML") -> None:
+        """Send 2 to MEDIA_GROUP_MAX (photo_url, caption) pairs as one album."""
+        if not 2 <= len(items) <= MEDIA_GROUP_MAX:
+            raise ValueError(f"sendMediaGroup needs 2-{MEDIA_GROUP_MAX} items, got {len(items)}")
+        if self._sending_disabled:
+            self._log_dry_run("media group", [caption for _, caption in items])
+            return
+        media = []
+        for photo, caption in items:
+            entry = {"type": "photo", "media": photo, "caption": caption}
+            if parse_mode is not None:
+                entry["parse_mode"] = parse_mode
+            media.append(entry)
+        self._post(self._prep_media_group, {"chat_id": self.chat_id, "media": media}, "sendMediaGroup")